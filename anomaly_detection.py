@@ -0,0 +1,216 @@
+import math
+import pandas as pd
+from typing import Dict, Any, List
+
+
+class CusumDetector:
+    """
+    Streaming change point and outlier detector for a single metric
+
+    Each observation is compared with a one-step-ahead Holt (level + slope)
+    forecast of the current segment, so steady trends are followed rather
+    than flagged. The forecast errors are standardised by their running
+    scale and fed to a two-sided CUSUM. Every update is O(1); the only
+    look-back is dropping outliers that turn out to belong to a new segment,
+    and each outlier is dropped at most once.
+    """
+
+    def __init__(self, threshold: float = 8.0, drift: float = 0.5,
+                 outlier_z: float = 4.0, warmup: int = 10,
+                 alpha: float = 0.3, beta: float = 0.05, scale_alpha: float = 0.05,
+                 rewarm: int = 5):
+        """
+        Args:
+            threshold (float): CUSUM decision level (h) in standard deviations
+            drift (float): CUSUM allowance (k) subtracted at every step
+            outlier_z (float): |z| above which a single observation is an outlier
+            warmup (int): Observations needed in a segment before testing starts
+            alpha (float): Holt smoothing weight for the level
+            beta (float): Holt smoothing weight for the slope
+            scale_alpha (float): Weight of a new forecast error in the running scale
+            rewarm (int): Observations after a change point before the CUSUM
+                resumes; outliers are tested throughout, against the previous
+                segment's scale until then
+        """
+        self.threshold = threshold
+        self.drift = drift
+        self.outlier_z = outlier_z
+        self.warmup = warmup
+        self.alpha = alpha
+        self.beta = beta
+        self.scale_alpha = scale_alpha
+        self.rewarm = rewarm
+
+        self.index = -1
+        self.change_points: List[int] = []
+        self.outliers: List[int] = []
+        self._reset_segment(0)
+
+    def _reset_segment(self, start: int, carried_std: float = 0.0):
+        self.segment_start = start
+        self.seen = 0
+        self.count = 0
+        self.level = 0.0
+        self.slope = 0.0
+        self._var = 0.0
+        self._scale_n = 0
+        self._carried_std = carried_std
+        self._cusum_after = self.rewarm if carried_std else self.warmup
+        self._pos = 0.0
+        self._neg = 0.0
+        self._pos_start = start
+        self._neg_start = start
+
+    @property
+    def forecast(self) -> float:
+        return self.level + self.slope
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._var)
+
+    def _absorb(self, value: float):
+        self.count += 1
+        if self.count == 1:
+            self.level = value
+            return
+
+        error = value - self.forecast
+        # Plain average of squared errors while warming up, then exponential
+        self._scale_n += 1
+        weight = max(1.0 / self._scale_n, self.scale_alpha)
+        self._var += weight * (error * error - self._var)
+
+        previous_level = self.level
+        self.level = self.forecast + self.alpha * error
+        self.slope += self.beta * (self.level - previous_level - self.slope)
+
+    def _change_point(self, start: int, value: float, event: Dict[str, Any]):
+        while self.outliers and self.outliers[-1] >= start:
+            self.outliers.pop()
+        self.change_points.append(start)
+        event['change_point'] = start
+
+        # The new segment estimates its own level and scale, starting from the
+        # value that confirmed the shift. Until it has `rewarm` observations
+        # the previous scale stands in for outlier tests, so the detector is
+        # never blind after a change point
+        carried_std = max(self.std, 1e-12)
+        self._reset_segment(start, carried_std)
+        self.seen = 1
+        self._absorb(value)
+
+    def update(self, value: float) -> Dict[str, Any]:
+        """
+        Feed the next observation
+
+        Args:
+            value (float): Next value of the metric, in time order
+
+        Returns:
+            Dictionary with 'index', 'z', 'outlier' and 'change_point' (the
+            index where the new segment starts, or None)
+        """
+        self.index += 1
+        event = {'index': self.index, 'z': 0.0, 'outlier': False, 'change_point': None}
+
+        if value is None or math.isnan(value):
+            return event
+
+        self.seen += 1
+        # The first segment has no scale to test against until it has warmed up
+        if not self._carried_std and self.seen <= self.warmup:
+            self._absorb(value)
+            return event
+
+        rewarming = self.seen <= self._cusum_after
+        scale = max(self.std, self._carried_std) if rewarming else self.std
+        # Floor the scale so flat stretches (e.g. a constant CS) stay finite
+        scale = max(scale, 1e-6 * abs(self.level), 1e-12)
+        z = (value - self.forecast) / scale
+        event['z'] = z
+
+        if rewarming:
+            # Outliers are flagged, but every value feeds the new segment's
+            # estimates so a badly placed level cannot lock everything out
+            if abs(z) > self.outlier_z:
+                self.outliers.append(self.index)
+                event['outlier'] = True
+            self._absorb(value)
+            return event
+
+        # Clipping bounds what one spike can add to the CUSUM, so a lone
+        # outlier is flagged as such while a persistent shift still trips it
+        clipped = max(-self.outlier_z, min(self.outlier_z, z))
+        if self._pos == 0.0:
+            self._pos_start = self.index
+        if self._neg == 0.0:
+            self._neg_start = self.index
+        self._pos = max(0.0, self._pos + clipped - self.drift)
+        self._neg = max(0.0, self._neg - clipped - self.drift)
+
+        if self._pos > self.threshold or self._neg > self.threshold:
+            start = self._pos_start if self._pos > self.threshold else self._neg_start
+            self._change_point(start, value, event)
+            return event
+
+        if abs(z) > self.outlier_z:
+            # Keep the outlier out of the level/scale so it cannot mask the next one
+            self.outliers.append(self.index)
+            event['outlier'] = True
+        else:
+            self._absorb(value)
+
+        return event
+
+
+def _as_float(value) -> float:
+    # Missing metrics in a streamed row are gaps, not errors
+    return math.nan if value is None else float(value)
+
+
+class StreamingAnomalyMonitor:
+    """
+    Runs one CusumDetector per metric over rows as they arrive
+    """
+
+    def __init__(self, metrics: List[str], **detector_kwargs):
+        """
+        Args:
+            metrics (List[str]): Column names to monitor
+            **detector_kwargs: Passed through to every CusumDetector
+        """
+        self.metrics = metrics
+        self.detectors = {metric: CusumDetector(**detector_kwargs) for metric in metrics}
+
+    def update(self, row: Dict[str, float]) -> Dict[str, Dict[str, Any]]:
+        """
+        Feed one row (mapping metric -> value) to every detector
+
+        A metric that is missing from the row or None is skipped as a gap
+
+        Returns:
+            Dictionary mapping metric to the detector event for this row
+        """
+        return {metric: self.detectors[metric].update(_as_float(row.get(metric)))
+                for metric in self.metrics}
+
+    def run(self, df: pd.DataFrame) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Stream a whole DataFrame (already in time order) through the monitor
+
+        Returns:
+            Dictionary mapping metric to positional 'change_points' and 'outliers'
+        """
+        for row in df[self.metrics].itertuples(index=False, name=None):
+            self.update(dict(zip(self.metrics, row)))
+        return self.results()
+
+    def results(self) -> Dict[str, Dict[str, List[int]]]:
+        return {
+            metric: {
+                'change_points': list(detector.change_points),
+                'outliers': list(detector.outliers)
+            }
+            for metric, detector in self.detectors.items()
+        }
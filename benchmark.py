@@ -0,0 +1,461 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Callable
+
+from test1 import TokenGovernanceAnalyzer
+from test2 import TokenMetricsIntegrator
+from forecasting import sarimax_forecast, joint_forecast, load_joint_history
+
+# Integrator metric name -> column in the governance CSV
+FORECAST_METRICS = {
+    'PR': 'PR',
+    'PSI': 'PSI',
+    'VPI': 'VPI',
+    'LAR': 'LAR',
+    'Actual_VPI': 'Actual VPI'
+}
+
+
+def _date_range(rows: int, start: str = '2000-01-01') -> pd.DatetimeIndex:
+    # Daily like the real data, falling back to finer steps when the span
+    # would leave the range pandas timestamps can represent
+    for freq in ['D', 'h', 'min']:
+        span = pd.Timedelta(1, unit=freq) * rows
+        if pd.Timestamp(start) + span < pd.Timestamp('2260-01-01'):
+            return pd.date_range(start=start, periods=rows, freq=freq)
+    raise ValueError(f"Too many rows for a synthetic date range: {rows}")
+
+
+def generate_governance_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic dataset in the merged_data.csv schema
+
+    Values follow the shape of the real metrics (random walks around the
+    observed levels, a stepped circulating supply) with a few level shifts and
+    spikes so the anomaly detector has something to find.
+
+    Args:
+        rows (int): Number of rows
+        seed (int): Random seed
+
+    Returns:
+        DataFrame with Date, PR, PSI, VPI, LAR, Actual VPI, VS, CS columns,
+        newest first like merged_data.csv
+    """
+    rng = np.random.default_rng(seed)
+
+    def walk(start, step, low, high):
+        return np.clip(start + np.cumsum(rng.normal(0, step, rows)), low, high)
+
+    # Circulating supply grows in occasional unlock steps
+    unlocks = rng.random(rows) < 1 / 45
+    cs = 9.1e8 + np.cumsum(unlocks * rng.uniform(2e7, 6e7, rows))
+
+    pr = walk(0.084, 0.0005, 0.05, 0.12)
+    lar = walk(0.28, 0.02, 0.05, 1.3)
+    shifts = rng.random(rows) < 1 / 120
+    lar = np.clip(lar + np.cumsum(shifts * rng.normal(0, 0.15, rows)), 0.05, 1.3)
+    spikes = rng.random(rows) < 1 / 200
+    lar = np.where(spikes, lar * rng.uniform(1.5, 2.5, rows), lar)
+
+    # Keep the time of day when the range is finer than daily, otherwise
+    # whole blocks of rows would share a date and lose their order
+    dates = _date_range(rows)
+    date_format = '%d-%m-%Y' if dates.freqstr == 'D' else '%d-%m-%Y %H:%M'
+
+    df = pd.DataFrame({
+        'Date': dates.strftime(date_format),
+        'PR': pr,
+        'PSI': np.clip(1.0 + rng.normal(0, 0.05, rows), 0.7, 1.4),
+        'VPI': walk(0.36, 0.005, 0.1, 0.7),
+        'LAR': lar,
+        'Actual VPI': np.abs(walk(0.018, 0.001, 0.0, 0.2)),
+        'VS': pr * cs,
+        'CS': cs
+    })
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def generate_forecast_data(rows: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """
+    Generate synthetic forecast files in the *-forecast-data.csv layout
+
+    Args:
+        rows (int): Number of forecasted days per metric
+        seed (int): Random seed
+
+    Returns:
+        Dictionary mapping integrator metric name to a Date/Forecasted Value frame
+    """
+    history = generate_governance_data(rows, seed).iloc[::-1]
+    dates = _date_range(rows, start='2024-12-01')
+    return {
+        metric: pd.DataFrame({'Date': dates, 'Forecasted Value': history[column].values})
+        for metric, column in FORECAST_METRICS.items()
+    }
+
+
+def write_token_datasets(work_dir: str, rows: int, tokens: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Write one governance CSV and one set of forecast CSVs per token
+
+    Returns:
+        List of {'csv_path', 'file_paths'} entries, one per token
+    """
+    datasets = []
+    for token in range(tokens):
+        token_dir = os.path.join(work_dir, f'token_{token}')
+        os.makedirs(token_dir, exist_ok=True)
+
+        csv_path = os.path.join(token_dir, 'merged_data.csv')
+        generate_governance_data(rows, seed + token).to_csv(csv_path, index=False)
+
+        file_paths = {}
+        for metric, forecast_df in generate_forecast_data(rows, seed + token).items():
+            file_paths[metric] = os.path.join(token_dir, f'{metric}-forecast-data.csv')
+            forecast_df.to_csv(file_paths[metric], index=False)
+
+        datasets.append({'csv_path': csv_path, 'file_paths': file_paths})
+    return datasets
+
+
+_REFERENCE_FRAME = pd.DataFrame(np.random.default_rng(0).normal(size=(20000, 4)), columns=list('abcd'))
+
+
+def _reference_workload():
+    # Fixed pandas/numpy work timed next to every method, so a machine that
+    # is slower for a while (throttling, noisy neighbours) can be told apart
+    # from code that got slower
+    frame = _REFERENCE_FRAME
+    frame.rolling(7).mean().sum()
+    frame.groupby((frame['a'] * 10).round()).mean()
+    np.sort(frame.to_numpy(), axis=0)
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, memory: bool = True) -> Dict[str, Any]:
+    """
+    Time a callable and optionally record its peak traced memory
+
+    The best of `repeat` untraced runs is reported as the time, and a fixed
+    reference workload is timed alternately with them; memory comes from one
+    extra run under tracemalloc so tracing does not skew the timing.
+
+    Returns:
+        Dictionary with 'seconds', 'reference_seconds', 'peak_memory_mb' and
+        the last 'result'
+    """
+    best = float('inf')
+    reference = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _reference_workload()
+        reference = min(reference, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+
+    peak_memory_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': best, 'reference_seconds': reference, 'peak_memory_mb': peak_memory_mb, 'result': result}
+
+
+@contextlib.contextmanager
+def _working_directory(path: str):
+    # run_full_analysis writes some outputs relative to the cwd
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def analyzer_cases(analyzers: List[TokenGovernanceAnalyzer], out_dir: str) -> Dict[str, Callable]:
+    """Public TokenGovernanceAnalyzer methods, in the order they are timed"""
+    def each(call):
+        return lambda: [call(analyzer) for analyzer in analyzers]
+
+    return {
+        'descriptive_statistics': each(lambda a: a.descriptive_statistics()),
+        'detect_anomalies': each(lambda a: a.detect_anomalies()),
+        'segment_metric': each(lambda a: a.segment_metric('LAR')),
+        'winsorize_outliers': each(lambda a: a.winsorize_outliers()),
+        'descriptive_statistics_winsorized': each(lambda a: a.descriptive_statistics(winsorize=True)),
+        'export_cleaned_data': each(lambda a: a.export_cleaned_data(os.path.join(out_dir, 'cleaned.csv'))),
+        'correlation_analysis': each(lambda a: a.correlation_analysis()),
+        'lead_lag_analysis': each(lambda a: a.lead_lag_analysis()),
+        'optimal_vs_analysis': each(lambda a: a.optimal_vs_analysis()),
+        'attack_cost_model': each(lambda a: a.attack_cost_model()),
+        'monthly_statistics': each(lambda a: a.monthly_statistics()),
+        'visualize_metrics': each(lambda a: a.visualize_metrics(os.path.join(out_dir, 'viz.png'))),
+        # Without an API key both fall back to the offline text insights
+        'generate_llm_insights': each(lambda a: a.generate_llm_insights(None)),
+        'run_full_analysis': each(lambda a: a.run_full_analysis(output_dir=out_dir, llm_api_key=None)),
+    }
+
+
+def integrator_cases(integrators: List[TokenMetricsIntegrator]) -> Dict[str, Callable]:
+    """
+    Public TokenMetricsIntegrator methods, in the order they are timed
+
+    get_llm_predictions needs a live OpenAI call and is not benchmarked.
+    """
+    def each(call):
+        return lambda: [call(integrator) for integrator in integrators]
+
+    return {
+        'validate_files': each(lambda i: i.validate_files()),
+        'read_and_integrate_data': each(lambda i: i.read_and_integrate_data()),
+        'calculate_monthly_statistics': each(lambda i: i.calculate_monthly_statistics()),
+        'monthly_statistics_vs': each(lambda i: i.monthly_statistics_vs()),
+        'create_llm_prompt': each(lambda i: i.create_llm_prompt(i.calculate_monthly_statistics(),
+                                                                  i.monthly_statistics_vs())),
+    }
+
+
+def benchmark_config(rows: int, tokens: int, repeat: int = 5, memory: bool = True,
+                     forecast_max_rows: int = 2000, methods: List[str] = None,
+                     seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Benchmark every method for one (rows, tokens) configuration
+
+    `rows` is the total row count, split evenly across `tokens` independent
+    token histories. Forecasts are fitted on the first token only, and only
+    when its history has at most `forecast_max_rows` rows.
+
+    Returns:
+        List of result records
+    """
+    rows_per_token = rows // tokens
+    records = []
+
+    def record(name, fn, processed_rows):
+        if methods and name not in methods:
+            return None
+        measured = measure(fn, repeat=repeat, memory=memory)
+        records.append({
+            'rows': rows,
+            'tokens': tokens,
+            'method': name,
+            'seconds': measured['seconds'],
+            'reference_seconds': measured['reference_seconds'],
+            'rows_per_second': processed_rows / measured['seconds'] if measured['seconds'] > 0 else None,
+            'peak_memory_mb': measured['peak_memory_mb']
+        })
+        print(f"  {name:<60} {measured['seconds']:>10.4f}s")
+        return measured['result']
+
+    with tempfile.TemporaryDirectory() as work_dir, _working_directory(work_dir):
+        datasets = write_token_datasets(work_dir, rows_per_token, tokens, seed)
+        total_rows = rows_per_token * tokens
+
+        construct = lambda: [TokenGovernanceAnalyzer(d['csv_path']) for d in datasets]
+        analyzers = record('TokenGovernanceAnalyzer.__init__', construct, total_rows) or construct()
+        for name, fn in analyzer_cases(analyzers, work_dir).items():
+            record(f'TokenGovernanceAnalyzer.{name}', fn, total_rows)
+
+        construct = lambda: [TokenMetricsIntegrator(d['file_paths'], d['csv_path']) for d in datasets]
+        integrators = record('TokenMetricsIntegrator.__init__', construct, total_rows) or construct()
+        for name, fn in integrator_cases(integrators).items():
+            record(f'TokenMetricsIntegrator.{name}', fn, total_rows)
+
+        if rows_per_token <= forecast_max_rows:
+            history = generate_governance_data(rows_per_token, seed).iloc[::-1]
+            for metric, column in FORECAST_METRICS.items():
+                record(f'sarimax_forecast[{metric}]',
+                       lambda column=column: sarimax_forecast(history[column]), rows_per_token)
+            joint_history = history[list(FORECAST_METRICS.values())].reset_index(drop=True)
+            joint_history.index = pd.date_range('2000-01-01', periods=rows_per_token, freq='D')
+            record('joint_forecast', lambda: joint_forecast(joint_history), rows_per_token)
+
+    return records
+
+
+def compare_forecasters(history: pd.DataFrame, horizons: List[int] = (30, 90)) -> Dict[str, Any]:
+    """
+    Compare the joint model with the per-metric SARIMAX models
+
+    Both are trained once on all but the last max(horizons) days and roll
+    forward over them; each horizon is scored on its first days, so the
+    longer horizons show how far each model drifts from the data.
+
+    Args:
+        history (pd.DataFrame): Output of forecasting.load_joint_history
+        horizons (List[int]): Forecast lengths in days to score
+
+    Returns:
+        Dictionary with per-horizon, per-metric MAE for each model and total fit + forecast seconds
+    """
+    holdout = max(horizons)
+    train, test = history.iloc[:-holdout], history.iloc[-holdout:]
+
+    start = time.perf_counter()
+    sarimax = {column: sarimax_forecast(train[column], steps=holdout) for column in history.columns}
+    sarimax_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    joint = joint_forecast(train, steps=holdout)
+    joint_seconds = time.perf_counter() - start
+
+    return {
+        'holdout_days': holdout,
+        'mae': {
+            str(horizon): {
+                column: {
+                    'sarimax': float(np.abs(test[column].values[:horizon] - sarimax[column][:horizon]).mean()),
+                    'joint': float(np.abs(test[column].values[:horizon] - joint[column].values[:horizon]).mean())
+                }
+                for column in history.columns
+            }
+            for horizon in sorted(horizons)
+        },
+        'seconds': {'sarimax': sarimax_seconds, 'joint': joint_seconds}
+    }
+
+
+def compare_to_baseline(records: List[Dict[str, Any]], baseline: Dict[str, Any],
+                        tolerance: float = 1.25, min_seconds: float = 0.01,
+                        min_memory_mb: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Find methods that got slower or hungrier than a saved baseline
+
+    Times are first rescaled by how fast the reference workload ran next to
+    each method in the two runs, so a machine that is uniformly slower does
+    not look like a regression. A metric is then flagged only when it exceeds
+    the baseline by both the tolerance ratio and the absolute floor, so
+    sub-millisecond timings and allocator jitter do not count either.
+
+    Args:
+        records: Fresh result records
+        baseline: Contents of a previously saved results file
+        tolerance (float): Allowed ratio of new to baseline before flagging
+        min_seconds (float): Slowdowns smaller than this many seconds are ignored
+        min_memory_mb (float): Peak memory increases smaller than this are ignored
+
+    Returns:
+        List of regressions with the metric, baseline and current (rescaled) values
+    """
+    previous = {(r['rows'], r['tokens'], r['method']): r for r in baseline['results']}
+    floors = {'seconds': min_seconds, 'peak_memory_mb': min_memory_mb}
+    regressions = []
+    for current in records:
+        old = previous.get((current['rows'], current['tokens'], current['method']))
+        if old is None:
+            continue
+        for metric, floor in floors.items():
+            if not old.get(metric) or not current.get(metric):
+                continue
+            value = current[metric]
+            if metric == 'seconds' and old.get('reference_seconds') and current.get('reference_seconds'):
+                value *= old['reference_seconds'] / current['reference_seconds']
+            if value > old[metric] * tolerance and value - old[metric] > floor:
+                regressions.append({
+                    'rows': current['rows'],
+                    'tokens': current['tokens'],
+                    'method': current['method'],
+                    'metric': metric,
+                    'baseline': old[metric],
+                    'current': value
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the token governance analyzers and forecasters')
+    parser.add_argument('--rows', type=float, nargs='*', default=[1e3, 1e4, 1e5],
+                        help='Total rows per configuration (1e3 to 1e7); pass none to skip the grid')
+    parser.add_argument('--tokens', type=int, nargs='+', default=[1, 10],
+                        help='Number of tokens the rows are split across (1 to 1000)')
+    parser.add_argument('--methods', nargs='+', help='Only run these benchmark names')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed runs per method; the fastest is kept to damp scheduler noise')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--forecast-max-rows', type=int, default=2000,
+                        help='Largest per-token history to fit forecasts on')
+    parser.add_argument('--min-rows-per-token', type=int, default=30,
+                        help='Skip configurations with fewer rows per token')
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to save results')
+    parser.add_argument('--baseline', help='Saved results to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='Allowed ratio of new to baseline. Times are rescaled by a reference workload '
+                             'timed alongside each method, and a method regresses only if it is also slower '
+                             'by more than --min-seconds (or uses more than --min-memory-mb extra)')
+    parser.add_argument('--min-seconds', type=float, default=0.01,
+                        help='Slowdowns below this many seconds never count as regressions')
+    parser.add_argument('--min-memory-mb', type=float, default=1.0,
+                        help='Peak memory increases below this many MB never count as regressions')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare-forecasters', action='store_true',
+                        help='Score the joint model against the per-metric SARIMAX models on real data')
+    parser.add_argument('--data', default='merged_data.csv', help='Governance data for --compare-forecasters')
+    parser.add_argument('--op-price', help='OP price CSV (snapped_at, price) for --compare-forecasters')
+    parser.add_argument('--horizons', type=int, nargs='+', default=[30, 90],
+                        help='Forecast lengths in days scored by --compare-forecasters')
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    records = []
+    for rows in [int(r) for r in args.rows]:
+        for tokens in args.tokens:
+            if rows // tokens < args.min_rows_per_token:
+                print(f"Skipping rows={rows} tokens={tokens}: too few rows per token")
+                continue
+            print(f"rows={rows} tokens={tokens}")
+            records.extend(benchmark_config(rows, tokens,
+                                            repeat=args.repeat,
+                                            memory=not args.no_memory,
+                                            forecast_max_rows=args.forecast_max_rows,
+                                            methods=args.methods,
+                                            seed=args.seed))
+
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'results': records
+    }
+    if args.compare_forecasters:
+        comparison = compare_forecasters(load_joint_history(args.data, args.op_price), args.horizons)
+        for horizon, columns in comparison['mae'].items():
+            for column, scores in columns.items():
+                print(f"  MAE {horizon:>3}d {column:<12} sarimax={scores['sarimax']:.6f} joint={scores['joint']:.6f}")
+        print(f"  seconds          sarimax={comparison['seconds']['sarimax']:.2f} "
+              f"joint={comparison['seconds']['joint']:.2f}")
+        results['forecaster_comparison'] = comparison
+    with open(output_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output_path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(records, json.load(f), args.tolerance,
+                                              args.min_seconds, args.min_memory_mb)
+        for r in regressions:
+            print(f"REGRESSION {r['method']} rows={r['rows']} tokens={r['tokens']} "
+                  f"{r['metric']}: {r['baseline']:.4f} -> {r['current']:.4f}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# statsmodels is only needed for forecasting, not for the analyzers
+try:
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    from statsmodels.tsa.api import VAR
+    from statsmodels.tsa.vector_ar.vecm import VECM, select_order, select_coint_rank
+except ImportError:
+    SARIMAX = None
+    VAR = None
+    VECM = None
+
+
+FORECAST_HORIZON = 396
+EXOG_VARS = ['lag_1', 'lag_2', 'rolling_mean_3', 'rolling_std_3']
+
+# Column in the joint history -> folder/file stem under Votable-supply-data-forecasting
+FORECAST_FOLDERS = {
+    'PR': 'PR',
+    'PSI': 'PSI',
+    'VPI': 'VPI',
+    'LAR': 'LAR',
+    'Actual VPI': 'Actual-VPI',
+    'OP Price': 'OP-price'
+}
+
+
+def sarimax_forecast(series: pd.Series, steps: int = FORECAST_HORIZON) -> np.ndarray:
+    """
+    Fit the per-metric SARIMAX model used in the forecasting notebooks and
+    roll it forward
+
+    Mirrors Votable-supply-data-forecasting/<metric>/<metric>.ipynb: a
+    SARIMA(1,1,1)(1,1,1,12) with lag and rolling features as exogenous
+    variables, forecast one step at a time while the features are updated
+    from the previous forecast.
+
+    Args:
+        series (pd.Series): Metric history, oldest first
+        steps (int): Number of days to forecast
+
+    Returns:
+        Array of forecasted values
+    """
+    if SARIMAX is None:
+        raise ImportError("statsmodels is required for SARIMAX forecasting")
+
+    values = pd.Series(np.asarray(series, dtype=float))
+    train_data = pd.DataFrame({'y': values})
+    train_data['lag_1'] = values.shift(1)
+    train_data['lag_2'] = values.shift(2)
+    train_data['rolling_mean_3'] = values.rolling(window=3).mean()
+    train_data['rolling_std_3'] = values.rolling(window=3).std()
+    train_data = train_data.dropna()
+
+    sarima_model = SARIMAX(train_data['y'],
+                           order=(1, 1, 1),
+                           seasonal_order=(1, 1, 1, 12),
+                           exog=train_data[EXOG_VARS],
+                           enforce_stationarity=False,
+                           enforce_invertibility=False)
+    sarima_results = sarima_model.fit(disp=False)
+
+    last_lag_1 = values.iloc[-1]
+    last_lag_2 = values.iloc[-2]
+    rolling_mean_3 = values.rolling(window=3).mean().iloc[-1]
+    rolling_std_3 = values.rolling(window=3).std().iloc[-1]
+
+    forecast_values = []
+    for _ in range(steps):
+        future_exog = pd.DataFrame({
+            'lag_1': [last_lag_1],
+            'lag_2': [last_lag_2],
+            'rolling_mean_3': [rolling_mean_3],
+            'rolling_std_3': [rolling_std_3]
+        })
+        forecast_step = float(np.asarray(sarima_results.forecast(steps=1, exog=future_exog))[0])
+        forecast_values.append(forecast_step)
+
+        # Same feature updates as the notebooks
+        last_lag_2 = last_lag_1
+        last_lag_1 = forecast_step
+        rolling_mean_3 = (rolling_mean_3 * 2 + forecast_step) / 3
+        rolling_std_3 = ((rolling_std_3 ** 2 * 2) + (forecast_step - rolling_mean_3) ** 2) / 3
+
+    return np.array(forecast_values)
+
+
+def write_forecast_csv(start_date, values, output_path: str):
+    """
+    Save a forecast in the *-forecast-data.csv layout (Date, Forecasted Value)
+
+    Args:
+        start_date: First forecasted day
+        values: Forecasted values, one per day
+        output_path (str): Path of the CSV to write
+    """
+    forecast_df = pd.DataFrame({
+        'Date': pd.date_range(start=start_date, periods=len(values), freq='D'),
+        'Forecasted Value': values
+    })
+    forecast_df.to_csv(output_path, index=False)
+
+
+def load_joint_history(csv_path: str, op_price_path: str = None) -> pd.DataFrame:
+    """
+    Load the metrics forecast by the joint model, oldest day first
+
+    Args:
+        csv_path (str): Governance data in the merged_data.csv layout
+        op_price_path (str, optional): OP price history in the CoinGecko export
+            layout used by the OP-price notebook (snapped_at, price); it must
+            cover every governance date, and missing days inside it are
+            interpolated
+
+    Returns:
+        DataFrame indexed by Date with PR, PSI, VPI, LAR, Actual VPI and,
+        when a price file is given, OP Price
+    """
+    df = pd.read_csv(csv_path)
+    df['Date'] = pd.to_datetime(df['Date'], format='%d-%m-%Y')
+    history = df.set_index('Date').sort_index()[['PR', 'PSI', 'VPI', 'LAR', 'Actual VPI']]
+
+    if op_price_path:
+        prices = pd.read_csv(op_price_path)
+        prices['Date'] = pd.to_datetime(prices['snapped_at'].str.replace(" UTC", "")).dt.normalize()
+        prices = prices.set_index('Date')['price']
+        # CoinGecko "max" exports add an intraday snapshot for the current day
+        prices = prices[~prices.index.duplicated(keep='last')]
+        # Filling outside the price range would invent flat stretches the model fits as data
+        if prices.empty or prices.index.min() > history.index[0] or prices.index.max() < history.index[-1]:
+            span = f"{prices.index.min().date()} to {prices.index.max().date()}" if not prices.empty else "no dates"
+            raise ValueError(f"OP price file {op_price_path} covers {span}, but the governance data "
+                             f"runs from {history.index[0].date()} to {history.index[-1].date()}")
+        prices = prices.reindex(prices.index.union(history.index)).interpolate(method='time', limit_area='inside')
+        history['OP Price'] = prices.reindex(history.index)
+
+    return history
+
+
+def _fit_var(endog: np.ndarray, max_lags: int, trend: str):
+    results = VAR(endog).fit(maxlags=max_lags, ic='aic', trend=trend)
+    if results.k_ar == 0:
+        results = VAR(endog).fit(1, trend=trend)
+    return results
+
+
+def joint_forecast(history: pd.DataFrame, steps: int = FORECAST_HORIZON,
+                   max_lags: int = 14, model: str = 'vecm') -> pd.DataFrame:
+    """
+    Forecast all metrics together with one multivariate model
+
+    Every equation is estimated in a single fit, so each metric's forecast
+    uses the recent history of all the others. The lag order is chosen by AIC
+    up to `max_lags`.
+
+    - 'vecm' (default): vector error correction model. Day-over-day changes
+      are driven by recent changes and by how far the metrics are from their
+      long-run (cointegrating) relations, with the cointegration rank picked
+      by Johansen's trace test. Forecasts correct towards those relations
+      rather than carrying trends forward for a year.
+    - 'var': VAR in levels with a constant; forecasts revert to the
+      historical means over several months.
+    - 'var_diff': VAR on day-over-day changes without drift, summed back onto
+      the last observed levels.
+
+    These are point forecasts of mean behaviour, not simulated paths. With
+    'vecm' and 'var_diff' the dynamics die out within about a month and the
+    rest of the horizon is flat; only 'var' keeps moving, towards the sample
+    means. None of them reproduce the day-to-day variation of the history.
+
+    Args:
+        history (pd.DataFrame): One column per metric, indexed by consecutive days, oldest first
+        steps (int): Number of days to forecast
+        max_lags (int): Largest lag order considered
+        model (str): 'vecm', 'var' or 'var_diff'
+
+    Returns:
+        DataFrame of forecasts indexed by the following `steps` days
+    """
+    if VAR is None:
+        raise ImportError("statsmodels is required for joint forecasting")
+
+    values = history.to_numpy(dtype=float)
+
+    if model == 'vecm':
+        k_ar_diff = max(select_order(values, maxlags=max_lags, deterministic='ci').aic, 1)
+        rank = select_coint_rank(values, det_order=0, k_ar_diff=k_ar_diff).rank
+        # No cointegration is a VAR in differences; full rank is a stationary VAR
+        if rank == 0:
+            model = 'var_diff'
+        elif rank == values.shape[1]:
+            model = 'var'
+        else:
+            results = VECM(values, k_ar_diff=k_ar_diff, coint_rank=rank, deterministic='ci').fit()
+            forecast = results.predict(steps=steps)
+
+    if model == 'var':
+        results = _fit_var(values, max_lags, trend='c')
+        forecast = results.forecast(values[-results.k_ar:], steps=steps)
+    elif model == 'var_diff':
+        changes = np.diff(values, axis=0)
+        results = _fit_var(changes, max_lags, trend='n')
+        forecast = values[-1] + np.cumsum(results.forecast(changes[-results.k_ar:], steps=steps), axis=0)
+    elif model != 'vecm':
+        raise ValueError(f"Unsupported joint model: {model}")
+
+    future_dates = pd.date_range(start=history.index[-1] + pd.Timedelta(days=1), periods=steps, freq='D')
+    return pd.DataFrame(forecast, index=future_dates, columns=history.columns)
+
+
+def write_joint_forecasts(forecast: pd.DataFrame, output_dir: str) -> dict:
+    """
+    Save each forecast column as <output_dir>/<Metric>/<Metric>-forecast-data.csv
+
+    Args:
+        forecast (pd.DataFrame): Output of joint_forecast
+        output_dir (str): Root folder, laid out like Votable-supply-data-forecasting
+
+    Returns:
+        Dictionary mapping column name to the written file path
+    """
+    paths = {}
+    for column in forecast.columns:
+        folder = FORECAST_FOLDERS.get(column, column.replace(' ', '-'))
+        os.makedirs(os.path.join(output_dir, folder), exist_ok=True)
+        paths[column] = os.path.join(output_dir, folder, f'{folder}-forecast-data.csv')
+        write_forecast_csv(forecast.index[0], forecast[column].values, paths[column])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Forecast all governance metrics with one joint model')
+    parser.add_argument('--data', default='merged_data.csv', help='Governance data CSV')
+    parser.add_argument('--op-price', help='OP price CSV (snapped_at, price) to forecast alongside')
+    parser.add_argument('--output-dir', default='Votable-supply-data-forecasting-joint',
+                        help='Root folder for the *-forecast-data.csv files')
+    parser.add_argument('--steps', type=int, default=FORECAST_HORIZON)
+    parser.add_argument('--max-lags', type=int, default=14)
+    parser.add_argument('--model', choices=['vecm', 'var', 'var_diff'], default='vecm')
+    args = parser.parse_args()
+
+    history = load_joint_history(args.data, args.op_price)
+    forecast = joint_forecast(history, steps=args.steps, max_lags=args.max_lags, model=args.model)
+    for column, path in write_joint_forecasts(forecast, args.output_dir).items():
+        print(f"{column}: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+import numpy as np
+import scipy.stats as stats
+from scipy import fft
+from typing import Dict, Any
+
+
+def _window_sums(z: np.ndarray, lengths: np.ndarray):
+    """
+    Sum and centred sum of squares of the first and the last `lengths` rows
+    of every column, from cumulative sums in O(n) per column
+    """
+    n = z.shape[0]
+    csum = np.vstack([np.zeros(z.shape[1]), np.cumsum(z, axis=0)])
+    csq = np.vstack([np.zeros(z.shape[1]), np.cumsum(z * z, axis=0)])
+    m = lengths[:, None]
+
+    head_sum, head_sq = csum[lengths], csq[lengths]
+    tail_sum, tail_sq = csum[n] - csum[n - lengths], csq[n] - csq[n - lengths]
+    return (head_sum, head_sq - head_sum ** 2 / m), (tail_sum, tail_sq - tail_sum ** 2 / m)
+
+
+def cross_correlations(data: np.ndarray, max_lag: int, method: str = 'pearson') -> np.ndarray:
+    """
+    Lagged cross-correlation of every column pair via FFT
+
+    Each column is transformed once; every pair then costs one spectrum
+    product and one inverse FFT, O(n log n) regardless of how many lags are
+    kept. The means and variances of each lag's overlapping window come from
+    cumulative sums, so every lag is the exact Pearson correlation of the
+    observations it pairs up.
+
+    Args:
+        data (np.ndarray): Array of shape (n, p), oldest row first, no NaNs
+        max_lag (int): Largest lag kept in each direction, at most n // 2
+        method (str): 'pearson' or 'spearman' (ranks over the full sample are
+            correlated instead)
+
+    Returns:
+        Array of shape (2 * max_lag + 1, p, p) where [max_lag + k, i, j] is
+        corr(x_i[t], x_j[t + k]); positive k means column i leads column j.
+        NaN where either window is constant
+    """
+    if method == 'spearman':
+        data = np.apply_along_axis(stats.rankdata, 0, data)
+    elif method != 'pearson':
+        raise ValueError(f"Unsupported correlation method: {method}")
+
+    n, p = data.shape
+    # Every lag must average over at least half the series, or the far lags
+    # rest on a handful of pairs
+    if not 0 <= max_lag <= n // 2:
+        raise ValueError(f"max_lag must be between 0 and {n // 2} (half the {n} observations)")
+
+    # Correlation is unaffected by scaling; this only keeps the sums well conditioned
+    std = data.std(axis=0)
+    z = (data - data.mean(axis=0)) / np.where(std > 0, std, 1.0)
+
+    # Zero padding to >= 2n - 1 turns the circular correlation into a linear one
+    nfft = fft.next_fast_len(2 * n - 1, real=True)
+    spectra = fft.rfft(z, n=nfft, axis=0)
+
+    lags = np.arange(-max_lag, max_lag + 1)
+    lengths = n - np.abs(lags)
+    (head_sum, head_ss), (tail_sum, tail_ss) = _window_sums(z, lengths)
+    # Column i is paired from its start and column j up to its end when i leads
+    leads = (lags >= 0)[:, None]
+    lead_sum, lead_ss = np.where(leads, head_sum, tail_sum), np.where(leads, head_ss, tail_ss)
+    lag_sum, lag_ss = np.where(leads, tail_sum, head_sum), np.where(leads, tail_ss, head_ss)
+    # Rounding leaves a constant window with a tiny positive sum of squares
+    lead_ss[lead_ss <= 1e-10 * lengths[:, None]] = np.nan
+    lag_ss[lag_ss <= 1e-10 * lengths[:, None]] = np.nan
+
+    result = np.empty((len(lags), p, p))
+    for i in range(p):
+        raw = fft.irfft(np.conj(spectra[:, i:i + 1]) * spectra, n=nfft, axis=0)
+        # Negative lags wrap around to the end of the inverse transform
+        products = raw[lags % nfft]
+        covariance = products - lead_sum[:, i:i + 1] * lag_sum / lengths[:, None]
+        result[:, i, :] = covariance / np.sqrt(lead_ss[:, i:i + 1] * lag_ss)
+
+    return np.clip(result, -1.0, 1.0)
+
+
+def peak_lags(correlations: np.ndarray, n: int) -> Dict[str, Any]:
+    """
+    Summarise lagged correlations by the lag of strongest absolute correlation
+
+    The p-value is the two-sided t-test for a correlation over the overlapping
+    observations, Bonferroni-corrected for the number of lags searched. Pairs
+    with no defined correlation at any lag (a constant column) get NaN for
+    the peak and a p-value of 1.
+
+    Args:
+        correlations (np.ndarray): Output of cross_correlations
+        n (int): Number of observations the correlations were computed from
+
+    Returns:
+        Dictionary with 'peak_lag', 'peak_correlation' and 'p_value' arrays of shape (p, p)
+    """
+    n_lags = correlations.shape[0]
+    max_lag = n_lags // 2
+
+    strength = np.abs(correlations)
+    defined = ~np.isnan(strength).all(axis=0)
+    best = np.where(np.isnan(strength), -1.0, strength).argmax(axis=0)
+    peak_correlation = np.take_along_axis(correlations, best[None], axis=0)[0]
+    peak_lag = np.where(defined, best - max_lag, np.nan)
+
+    dof = np.maximum(n - np.abs(best - max_lag) - 2, 1)
+    r = np.clip(peak_correlation, -0.999999, 0.999999)
+    t = r * np.sqrt(dof / (1 - r ** 2))
+    p_value = np.minimum(1.0, 2 * stats.t.sf(np.abs(t), dof) * n_lags)
+    p_value = np.where(np.isnan(p_value), 1.0, p_value)
+
+    return {
+        'peak_lag': peak_lag,
+        'peak_correlation': peak_correlation,
+        'p_value': p_value
+    }
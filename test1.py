@@ -5,6 +5,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import Dict, Any
 import json
+from anomaly_detection import StreamingAnomalyMonitor
+from lead_lag import cross_correlations, peak_lags
 
 # Optional: For LLM integration (if using OpenAI)
 import openai
@@ -29,28 +31,130 @@ class TokenGovernanceAnalyzer:
         # Convert Date column to datetime
         self.df['Date'] = pd.to_datetime(self.df['Date'], dayfirst=True)
 
+        # Populated by detect_anomalies: metric -> change point / outlier row labels
+        self.anomalies = None
+
     
-    def descriptive_statistics(self) -> Dict[str, Any]:
+    def descriptive_statistics(self, winsorize: bool = False) -> Dict[str, Any]:
         """
         Generate descriptive statistics for key metrics
         
+        Args:
+            winsorize (bool): Clip detected outliers before computing the statistics
+        
         Returns:
             Dict containing detailed statistical summary
         """
         metrics = ['CS', 'VS', 'PR', 'PSI', 'LAR', 'VPI', 'Actual VPI']
+        df = self.winsorize_outliers() if winsorize else self.df
         stats_summary = {}
         
         for metric in metrics:
             stats_summary[metric] = {
-                'min': self.df[metric].min(),
-                'max': self.df[metric].max(),
-                'mean': self.df[metric].mean(),
-                'median': self.df[metric].median(),
-                'std': self.df[metric].std(),
-                'skew': self.df[metric].skew()
+                'min': df[metric].min(),
+                'max': df[metric].max(),
+                'mean': df[metric].mean(),
+                'median': df[metric].median(),
+                'std': df[metric].std(),
+                'skew': df[metric].skew()
             }
         
         return stats_summary
+
+    def detect_anomalies(self, **detector_kwargs) -> Dict[str, Any]:
+        """
+        Stream every metric in date order through a CUSUM detector to find
+        change points and outliers
+        
+        Args:
+            **detector_kwargs: Tuning passed to anomaly_detection.CusumDetector
+        
+        Returns:
+            Dictionary mapping each metric to its change point and outlier dates
+        """
+        metrics = ['PR', 'PSI', 'VPI', 'LAR', 'Actual VPI', 'VS', 'CS']
+        ordered = self.df.sort_values('Date', kind='stable')
+        results = StreamingAnomalyMonitor(metrics, **detector_kwargs).run(ordered)
+        
+        # Keep row labels so results line up with self.df whatever its order
+        self.anomalies = {
+            metric: {
+                'change_points': ordered.index[found['change_points']].tolist(),
+                'outliers': ordered.index[found['outliers']].tolist()
+            }
+            for metric, found in results.items()
+        }
+        
+        return {
+            metric: {
+                kind: self.df.loc[labels, 'Date'].dt.strftime('%d-%m-%Y').tolist()
+                for kind, labels in found.items()
+            }
+            for metric, found in self.anomalies.items()
+        }
+
+    def segment_metric(self, metric: str) -> list:
+        """
+        Split a metric's history at its detected change points
+        
+        Args:
+            metric (str): Metric column name
+        
+        Returns:
+            List of DataFrames (Date and metric), one per segment, oldest first
+        """
+        if self.anomalies is None:
+            self.detect_anomalies()
+        
+        ordered = self.df.sort_values('Date', kind='stable')[['Date', metric]]
+        boundaries = sorted(ordered.index.get_loc(label)
+                            for label in self.anomalies[metric]['change_points'])
+        edges = [0] + boundaries + [len(ordered)]
+        return [ordered.iloc[start:end] for start, end in zip(edges, edges[1:]) if end > start]
+
+    def winsorize_outliers(self, limits: float = 0.05) -> pd.DataFrame:
+        """
+        Clip detected outliers to the quantile range of their own segment, so
+        level shifts are preserved while one-off spikes are tamed
+        
+        Args:
+            limits (float): Quantile trimmed from each tail of a segment
+        
+        Returns:
+            Copy of the data with outliers winsorized
+        """
+        if self.anomalies is None:
+            self.detect_anomalies()
+        
+        cleaned = self.df.copy()
+        for metric, found in self.anomalies.items():
+            outliers = set(found['outliers'])
+            if not outliers:
+                continue
+            for segment in self.segment_metric(metric):
+                flagged = segment.index.isin(list(outliers))
+                if not flagged.any():
+                    continue
+                clean_values = segment.loc[~flagged, metric]
+                if clean_values.empty:
+                    continue
+                low, high = clean_values.quantile([limits, 1 - limits])
+                cleaned.loc[segment.index[flagged], metric] = segment.loc[flagged, metric].clip(low, high)
+        
+        return cleaned
+
+    def export_cleaned_data(self, output_path: str = 'merged_data_cleaned.csv', limits: float = 0.05):
+        """
+        Write winsorized data in the merged_data.csv layout for forecast training
+        
+        Args:
+            output_path (str): Path of the CSV to write
+            limits (float): Quantile trimmed from each tail of a segment
+        """
+        cleaned = self.winsorize_outliers(limits)
+        cleaned = cleaned[['Date', 'PR', 'PSI', 'VPI', 'LAR', 'Actual VPI', 'VS', 'CS']]
+        cleaned['Date'] = cleaned['Date'].dt.strftime('%d-%m-%Y')
+        cleaned.to_csv(output_path, index=False)
     
     def correlation_analysis(self) -> np.ndarray:
         """
@@ -62,6 +166,46 @@ class TokenGovernanceAnalyzer:
         metrics = ['CS', 'VS', 'PR', 'PSI', 'LAR', 'VPI', 'Actual VPI']
         correlation_matrix = self.df[metrics].corr()
         return correlation_matrix
+
+    def lead_lag_analysis(self, max_lag: int = None, method: str = 'pearson',
+                          differences: bool = True, metrics: list = None) -> Dict[str, pd.DataFrame]:
+        """
+        Find how many days each metric leads or lags every other metric
+        
+        Cross-correlations over all lags are computed with FFTs, so each pair
+        costs O(n log n) however wide the lag range is. Rows are assumed to be
+        consecutive days.
+        
+        Args:
+            max_lag (int, optional): Largest lag in days, at most half the history
+                and a quarter of it by default
+            method (str): 'pearson' or 'spearman'
+            differences (bool): Correlate day-over-day changes rather than levels,
+                which avoids spurious correlation between trending series
+            metrics (list, optional): Columns to analyze, the core metrics by default
+        
+        Returns:
+            Dictionary of metric x metric DataFrames: 'peak_lag' (positive when
+            the row metric leads the column metric), 'peak_correlation' and
+            'p_value' (Bonferroni-corrected over the lags searched). Pairs
+            involving a constant metric have NaN peaks and a p-value of 1
+        """
+        metrics = metrics or ['CS', 'VS', 'PR', 'PSI', 'LAR', 'VPI', 'Actual VPI']
+        series = self.df.sort_values('Date', kind='stable')[metrics]
+        if differences:
+            series = series.diff().iloc[1:]
+        series = series.dropna()
+        
+        if max_lag is None:
+            max_lag = len(series) // 4
+        
+        correlations = cross_correlations(series.to_numpy(dtype=float), max_lag, method)
+        summary = peak_lags(correlations, len(series))
+        
+        return {
+            name: pd.DataFrame(values, index=metrics, columns=metrics)
+            for name, values in summary.items()
+        }
     
     def optimal_vs_analysis(self) -> Dict[str, Any]:
         """
@@ -401,6 +545,10 @@ class TokenGovernanceAnalyzer:
         stats = self.descriptive_statistics()
         with open('descriptive_stats.json', 'w') as f:
             json.dump(stats, f, indent=2, default=convert_numpy_types)
+        # Change Points and Outliers
+        anomalies = self.detect_anomalies()
+        with open(f'{output_dir}/anomalies.json', 'w') as f:
+            json.dump(anomalies, f, indent=2)
         # Correlation Analysis
         corr_matrix = self.correlation_analysis()
         plt.figure(figsize=(10, 8))
@@ -410,6 +558,12 @@ class TokenGovernanceAnalyzer:
         plt.savefig(f'{output_dir}/correlation_heatmap.png')
         plt.close()
         
+        # Lead-Lag Analysis
+        lead_lag = self.lead_lag_analysis()
+        with open(f'{output_dir}/lead_lag.json', 'w') as f:
+            json.dump({name: frame.to_dict() for name, frame in lead_lag.items()},
+                      f, indent=2, default=convert_numpy_types)
+        
         # Visualize Metrics
         self.visualize_metrics(f'{output_dir}/token_metrics_viz.png')
         